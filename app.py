@@ -1,23 +1,236 @@
 #!/usr/bin/env python3
 
-from flask import Flask, request, jsonify, send_from_directory
-from flask_cors import CORS
+from quart import Quart, request, jsonify, send_from_directory
+from quart_cors import cors
+from quart.json.provider import JSONProvider
 import os
-import json
-from typing import List, Dict, Any
+import orjson
+import asyncio
+import datetime
+import hashlib
+import logging
+import re
+import threading
+import time
+from itertools import islice
+from typing import List, Dict, Any, Optional, Tuple, Iterator, AsyncIterator
 import google.generativeai as genai
-import requests
+import httpx
+import uvicorn
+import cachetools
+import redis.asyncio as redis
+from redis import Redis as SyncRedis  # rq needs a blocking client
+from redis.exceptions import RedisError
+from rq import Queue
+from rq.exceptions import NoSuchJobError
+from rq.job import Job, JobStatus
 from dotenv import load_dotenv
 
-app = Flask(__name__, static_folder='.')
-CORS(app)  # Enable CORS for frontend communication
+# Semantic cache dependencies, imported by the web server in start()
+faiss = np = SentenceTransformer = None
+
+class ORJSONProvider(JSONProvider):
+    """JSON provider that serializes responses with orjson."""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+app = Quart(__name__, static_folder='.')
+app.json = ORJSONProvider(app)
+app = cors(app)  # Enable CORS for frontend communication
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
+GEMINI_MODEL = 'gemini-2.5-flash'
+
+# Static prompt blocks shared by every request. The cache_control marker
+# sets a prefix-caching breakpoint for providers that support it.
+STATIC_PROMPT_BLOCKS: List[Dict[str, Any]] = [
+    {
+        'type': 'text',
+        'text': """You are a text reconstruction expert. Please analyze and reconstruct the text you are given.
+
+Please perform the following tasks:
+1. Expand all slang, abbreviations, and acronyms
+2. Explain the context and meaning of any colloquial expressions
+3. Fill in any missing words or complete incomplete sentences to make the text coherent
+4. Maintain the original tone and intent while making the text clear and professional
+5. If the text appears to be a fragment of a larger conversation, provide context about what might have been discussed
+
+Return only the reconstructed text without any additional commentary or formatting."""
+    },
+    {
+        'type': 'text',
+        'text': """Examples:
+- "lol" → "laughing out loud"
+- "brb" → "be right back"
+- "epic fail" → "a significant and embarrassing mistake or failure\"""",
+        'cache_control': {'type': 'ephemeral'}
+    }
+]
+
+# Gemini receives the static blocks once, as its (cached) system instruction
+SYSTEM_INSTRUCTION = '\n\n'.join(block['text'] for block in STATIC_PROMPT_BLOCKS)
+
+# Lifetime of the Gemini context cache holding SYSTEM_INSTRUCTION
+PROMPT_CACHE_TTL = datetime.timedelta(hours=1)
+
+# Words skipped when building a search query from reconstructed text
+_COMMON_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'was', 'are', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'})
+
+# Words of at least three characters starting with a letter, in any script
+_TOKEN_RE = re.compile(r"[^\W\d_][\w'-]{2,}")
+
+# Runs of letters in any script, used to spot inputs with nothing to reconstruct
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+# Number of key terms used in a search query
+SEARCH_TERM_COUNT = 7
+
+# How long reconstructed texts are kept in the response cache (seconds)
+RECONSTRUCTION_CACHE_TTL = 3600
+
+# How long web search results are kept in the search cache (seconds)
+SEARCH_CACHE_TTL = 1800
+
+def _cache_key(namespace: str, *parts: Any) -> str:
+    """Build a compact cache key from a 16-byte BLAKE2b digest of the parts."""
+    digest = hashlib.blake2b('\0'.join(map(str, parts)).encode(), digest_size=16).hexdigest()
+    return f'chronos:{namespace}:{digest}'
+
+def _normalize_input(input_text: str) -> str:
+    """Collapse whitespace in an input, keeping case since it marks acronyms ("US" vs "us")."""
+    return ' '.join(input_text.split())
+
+def _import_semantic_dependencies() -> bool:
+    """Import faiss, numpy and sentence-transformers, if they are installed."""
+    global faiss, np, SentenceTransformer
+    try:
+        import faiss
+        import numpy as np
+        from sentence_transformers import SentenceTransformer
+    except ImportError:  # semantic caching is disabled without these
+        return False
+    return True
+
+class SemanticCache:
+    """Embedding index that maps near-duplicate inputs to earlier reconstructions."""
+    
+    EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+    EMBEDDING_DIM = 384
+    SIMILARITY_THRESHOLD = 0.95
+    # Switch from exhaustive to inverted-file search past this many entries
+    IVF_THRESHOLD = 100_000
+    # The index is emptied once it holds this many entries or reaches the TTL
+    MAX_ENTRIES = 200_000
+    TTL = RECONSTRUCTION_CACHE_TTL
+    
+    def __init__(self):
+        """Load the embedding model and create an empty inner-product index."""
+        self.embed = SentenceTransformer(self.EMBEDDING_MODEL)
+        # Guards the index and cache_texts, which are used from worker threads
+        self._lock = threading.Lock()
+        self._rebuild_task: Optional[asyncio.Task] = None
+        self._reset()
+    
+    def _reset(self) -> None:
+        """Drop every entry and start a new flat index."""
+        self.index = faiss.IndexFlatIP(self.EMBEDDING_DIM)
+        self.cache_texts: List[str] = []
+        self._created = time.monotonic()
+    
+    def _expire(self) -> None:
+        """Reset the index once it is full or older than the TTL."""
+        if (len(self.cache_texts) >= self.MAX_ENTRIES
+                or time.monotonic() - self._created >= self.TTL):
+            self._reset()
+    
+    async def encode(self, input_text: str) -> 'np.ndarray':
+        """Embed normalized input text off the event loop."""
+        normalized = _normalize_input(input_text)
+        vector = await asyncio.to_thread(self.embed.encode, [normalized], normalize_embeddings=True)
+        return np.asarray(vector, dtype='float32')
+    
+    async def lookup(self, vector: 'np.ndarray') -> Optional[str]:
+        """Return the cached reconstruction of the closest input, if similar enough."""
+        return await asyncio.to_thread(self._lookup, vector)
+    
+    def _lookup(self, vector: 'np.ndarray') -> Optional[str]:
+        with self._lock:
+            self._expire()
+            if self.index.ntotal == 0:
+                return None
+            
+            scores, ids = self.index.search(vector, 1)
+            if ids[0][0] >= 0 and scores[0][0] >= self.SIMILARITY_THRESHOLD:
+                return self.cache_texts[ids[0][0]]
+            return None
+    
+    async def add(self, vector: 'np.ndarray', reconstructed_text: str) -> None:
+        """Index a new input embedding with its reconstruction."""
+        needs_rebuild = await asyncio.to_thread(self._add, vector, reconstructed_text)
+        
+        # Retrain in the background so this request does not wait for k-means
+        if needs_rebuild and self._rebuild_task is None:
+            self._rebuild_task = asyncio.create_task(self._rebuild_as_ivf())
+            self._rebuild_task.add_done_callback(self._rebuild_finished)
+    
+    def _add(self, vector: 'np.ndarray', reconstructed_text: str) -> bool:
+        with self._lock:
+            self._expire()
+            self.index.add(vector)
+            self.cache_texts.append(reconstructed_text)
+            return self.index.ntotal > self.IVF_THRESHOLD and isinstance(self.index, faiss.IndexFlat)
+    
+    def _rebuild_finished(self, task: asyncio.Task) -> None:
+        self._rebuild_task = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Semantic cache index rebuild failed: %s", task.exception())
+    
+    async def _rebuild_as_ivf(self) -> None:
+        """Replace the flat index with a trained IndexIVFFlat for faster search."""
+        flat_index, count, vectors = await asyncio.to_thread(self._snapshot)
+        ivf_index = await asyncio.to_thread(self._build_ivf_index, vectors)
+        await asyncio.to_thread(self._swap_in, flat_index, count, ivf_index)
+    
+    def _snapshot(self) -> Tuple['faiss.Index', int, 'np.ndarray']:
+        with self._lock:
+            count = self.index.ntotal
+            return self.index, count, self.index.reconstruct_n(0, count)
+    
+    def _swap_in(self, flat_index: 'faiss.Index', count: int, ivf_index: 'faiss.Index') -> None:
+        with self._lock:
+            # The cache was reset while training; the new index is already stale
+            if self.index is not flat_index:
+                return
+            
+            # Carry over anything added while the new index was being trained
+            if flat_index.ntotal > count:
+                ivf_index.add(flat_index.reconstruct_n(count, flat_index.ntotal - count))
+            self.index = ivf_index
+    
+    def _build_ivf_index(self, vectors: 'np.ndarray') -> 'faiss.Index':
+        """Train and fill an inverted-file index over the given vectors."""
+        nlist = int(4 * np.sqrt(len(vectors)))
+        quantizer = faiss.IndexFlatIP(self.EMBEDDING_DIM)
+        index = faiss.IndexIVFFlat(quantizer, self.EMBEDDING_DIM, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+        index.add(vectors)
+        index.nprobe = 16
+        return index
+
 class TextReconstructionService:
     """Service class for text reconstruction."""
     
+    # Per-request prompt block that follows STATIC_PROMPT_BLOCKS
+    _PROMPT_TEMPLATE = 'Original text: "{}"'
+    
     def __init__(self):
         """Initialize the service with API configurations."""
         # Initialize Gemini API
@@ -26,7 +239,8 @@ class TextReconstructionService:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
         
         genai.configure(api_key=self.gemini_api_key)
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
+        self.model = genai.GenerativeModel(GEMINI_MODEL, system_instruction=SYSTEM_INSTRUCTION)
+        self.prompt_cache = None
         
         # Initialize web search API
         self.search_api_key = os.getenv('GOOGLE_SEARCH_API_KEY')
@@ -34,33 +248,229 @@ class TextReconstructionService:
         
         if not self.search_api_key or not self.search_engine_id:
             raise ValueError("GOOGLE_SEARCH_API_KEY and GOOGLE_SEARCH_ENGINE_ID required")
+        
+        # HTTP/2 client for web search; created once the event loop is running
+        self.http: Optional[httpx.AsyncClient] = None
+        
+        # Exact-match cache of reconstructions, optionally shared through Redis
+        self._recon_cache = cachetools.TTLCache(maxsize=10_000, ttl=RECONSTRUCTION_CACHE_TTL)
+        self._search_cache = cachetools.TTLCache(maxsize=5000, ttl=SEARCH_CACHE_TTL)
+        redis_url = os.getenv('REDIS_URL')
+        self.redis = redis.Redis.from_url(redis_url) if redis_url else None
+        
+        # Near-duplicate cache, loaded by start() in the web server
+        self.semantic_cache: Optional[SemanticCache] = None
     
-    def reconstruct_text_with_ai(self, input_text: str) -> str:
-        """Reconstruct text using Google Gemini API."""
-        prompt = f"""
-        You are a text reconstruction expert. Please analyze and reconstruct the following text:
-
-        Original text: "{input_text}"
-
-        Please perform the following tasks:
-        1. Expand all slang, abbreviations, and acronyms (e.g., "lol" → "laughing out loud", "brb" → "be right back")
-        2. Explain the context and meaning of any colloquial expressions (e.g., "epic fail" → "a significant and embarrassing mistake or failure")
-        3. Fill in any missing words or complete incomplete sentences to make the text coherent
-        4. Maintain the original tone and intent while making the text clear and professional
-        5. If the text appears to be a fragment of a larger conversation, provide context about what might have been discussed
-
-        Return only the reconstructed text without any additional commentary or formatting.
+    def start(self) -> None:
+        """Set up the long-lived caches used by the web server.
+        
+        Kept out of __init__ and import time so rq job processes, which import
+        this module for every job, skip loading torch, the embedding model and
+        the context cache.
         """
+        self.refresh_prompt_cache()
+        
+        # Available when faiss and sentence-transformers are installed
+        if _import_semantic_dependencies():
+            self.semantic_cache = SemanticCache()
+    
+    def refresh_prompt_cache(self) -> None:
+        """Store the static instructions in a Gemini context cache and use it."""
+        try:
+            cached = genai.caching.CachedContent.create(
+                model=f'models/{GEMINI_MODEL}',
+                system_instruction=SYSTEM_INSTRUCTION,
+                ttl=PROMPT_CACHE_TTL
+            )
+        except Exception as e:
+            # Context caching has a minimum prompt size and is not available
+            # on every tier; keep sending the system instruction uncached.
+            logger.info("Gemini context caching unavailable: %s", e)
+            return
+        
+        previous, self.prompt_cache = self.prompt_cache, cached
+        self.model = genai.GenerativeModel.from_cached_content(cached_content=cached)
+        
+        if previous is not None:
+            try:
+                previous.delete()
+            except Exception as e:
+                logger.warning("Could not delete previous Gemini context cache: %s", e)
+    
+    def _gemini_prompt(self, input_text: str) -> str:
+        """Build the per-request prompt; the model already holds STATIC_PROMPT_BLOCKS."""
+        return self._PROMPT_TEMPLATE.format(input_text)
+    
+    async def reconstruct_text_with_ai(self, input_text: str) -> str:
+        """Reconstruct text using Google Gemini API."""
+        cached, vector = await self._lookup_reconstruction(input_text)
+        if cached is not None:
+            return cached
+        
+        prompt = self._gemini_prompt(input_text)
+        
+        try:
+            response = await self.model.generate_content_async(prompt)
+            reconstructed_text = response.text.strip()
+        except Exception as e:
+            raise Exception(f"Error calling Gemini API: {str(e)}")
+        
+        await self._store_reconstruction(input_text, vector, reconstructed_text)
+        return reconstructed_text
+    
+    async def stream_reconstruction(self, input_text: str) -> AsyncIterator[str]:
+        """Reconstruct text using Google Gemini API, yielding text as it is generated."""
+        cached, vector = await self._lookup_reconstruction(input_text)
+        if cached is not None:
+            yield cached
+            return
+        
+        prompt = self._gemini_prompt(input_text)
+        chunks = []
         
         try:
-            response = self.model.generate_content(prompt)
-            return response.text.strip()
+            response = await self.model.generate_content_async(prompt, stream=True)
+            async for chunk in response:
+                chunks.append(chunk.text)
+                yield chunk.text
         except Exception as e:
             raise Exception(f"Error calling Gemini API: {str(e)}")
+        
+        await self._store_reconstruction(input_text, vector, ''.join(chunks).strip())
+    
+    async def process(self, input_text: str) -> Dict[str, Any]:
+        """Reconstruct text and find its sources, returning the API result."""
+        # Steps 1-2: Reconstruct text, searching for sources once the query is known
+        chunks = []
+        async for kind, value in self.stream_reconstruction_with_sources(input_text):
+            if kind == 'chunk':
+                chunks.append(value)
+            else:
+                sources = value
+        
+        return {
+            'success': True,
+            'original_text': input_text,
+            'reconstructed_text': ''.join(chunks).strip(),
+            'sources': sources
+        }
+    
+    async def has_cached_reconstruction(self, input_text: str) -> bool:
+        """Check whether a reconstruction can be served without calling Gemini."""
+        cached, _ = await self._lookup_reconstruction(input_text)
+        return cached is not None
+    
+    async def stream_reconstruction_with_sources(self, input_text: str) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream the reconstruction, searching for sources while it is still generating.
+        
+        Yields ('chunk', text) items followed by a single ('sources', results) item.
+        """
+        chunks = []
+        search_task = None
+        
+        try:
+            async for chunk in self.stream_reconstruction(input_text):
+                chunks.append(chunk)
+                yield 'chunk', chunk
+                
+                if search_task is None:
+                    partial_text = ''.join(chunks)
+                    if self._search_terms_complete(partial_text):
+                        search_task = asyncio.create_task(self.search_contextual_sources(partial_text))
+            
+            if search_task is None:
+                sources = await self.search_contextual_sources(''.join(chunks).strip())
+            else:
+                sources = await search_task
+            
+            yield 'sources', sources
+            
+        finally:
+            if search_task is not None and not search_task.done():
+                search_task.cancel()
+    
+    async def _lookup_reconstruction(self, input_text: str) -> Tuple[Optional[str], Optional['np.ndarray']]:
+        """Look up a cached reconstruction, returning it with the input's embedding."""
+        # Trivial inputs are their own reconstruction
+        if self._is_trivial_input(input_text):
+            return input_text, None
+        
+        key = self._reconstruction_cache_key(input_text)
+        
+        cached = self._recon_cache.get(key)
+        if cached is not None:
+            return cached, None
+        
+        cached = await self._redis_get(key)
+        if cached is not None:
+            self._recon_cache[key] = cached.decode()
+            return self._recon_cache[key], None
+        
+        vector = None
+        if self.semantic_cache is not None:
+            vector = await self.semantic_cache.encode(input_text)
+            cached = await self.semantic_cache.lookup(vector)
+            if cached is not None:
+                self._recon_cache[key] = cached
+                return cached, vector
+        
+        return None, vector
     
-    def search_contextual_sources(self, reconstructed_text: str, num_results: int = 5) -> List[Dict[str, str]]:
+    async def _store_reconstruction(self, input_text: str, vector: Optional['np.ndarray'], reconstructed_text: str) -> None:
+        """Add a fresh reconstruction to every configured cache."""
+        key = self._reconstruction_cache_key(input_text)
+        
+        self._recon_cache[key] = reconstructed_text
+        await self._redis_setex(key, RECONSTRUCTION_CACHE_TTL, reconstructed_text)
+        if self.semantic_cache is not None:
+            await self.semantic_cache.add(vector, reconstructed_text)
+    
+    async def _redis_get(self, key: str) -> Optional[bytes]:
+        """Read a shared cache entry, treating Redis errors as a cache miss."""
+        if self.redis is None:
+            return None
+        
+        try:
+            return await self.redis.get(key)
+        except RedisError as e:
+            logger.warning("Redis cache read failed: %s", e)
+            return None
+    
+    async def _redis_setex(self, key: str, ttl: int, value: Any) -> None:
+        """Write a shared cache entry, skipping the write if Redis is unavailable."""
+        if self.redis is None:
+            return
+        
+        try:
+            await self.redis.setex(key, ttl, value)
+        except RedisError as e:
+            logger.warning("Redis cache write failed: %s", e)
+    
+    def _is_trivial_input(self, input_text: str) -> bool:
+        """Check whether the input has no words, or only common words, to reconstruct."""
+        words = _WORD_RE.findall(input_text.lower())
+        return all(word in _COMMON_WORDS for word in words)
+    
+    def _reconstruction_cache_key(self, input_text: str) -> str:
+        """Build the response cache key for a model and normalized input."""
+        return _cache_key('recon', GEMINI_MODEL, _normalize_input(input_text))
+    
+    async def search_contextual_sources(self, reconstructed_text: str, num_results: int = 5) -> List[Dict[str, str]]:
         """Find contextual sources using web search."""
         search_query = self._extract_search_terms(reconstructed_text)
+        if not search_query:
+            return []
+        
+        key = _cache_key('search', num_results, search_query)
+        
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        cached = await self._redis_get(key)
+        if cached is not None:
+            self._search_cache[key] = orjson.loads(cached)
+            return self._search_cache[key]
         
         search_url = "https://www.googleapis.com/customsearch/v1"
         params = {
@@ -71,72 +481,292 @@ class TextReconstructionService:
         }
         
         try:
-            response = requests.get(search_url, params=params)
+            response = await self.http.get(search_url, params=params)
             response.raise_for_status()
+            data = orjson.loads(response.content)
             
-            data = response.json()
-            results = []
-            
-            for item in data.get('items', []):
-                results.append({
+            results = [
+                {
                     'title': item.get('title', ''),
                     'link': item.get('link', ''),
                     'snippet': item.get('snippet', '')
-                })
-            
-            return results
+                }
+                for item in data.get('items', ())
+            ]
             
-        except requests.RequestException as e:
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
             raise Exception(f"Error performing web search: {str(e)}")
+        
+        self._search_cache[key] = results
+        await self._redis_setex(key, SEARCH_CACHE_TTL, orjson.dumps(results))
+        
+        return results
+    
+    def _search_terms_complete(self, partial_text: str) -> bool:
+        """Check whether more text can no longer change the extracted search terms.
+        
+        Only the last word of a partial text may still be cut off, so once a
+        keyword follows the first SEARCH_TERM_COUNT ones the query is final.
+        """
+        keywords = self._keywords(partial_text)
+        return sum(1 for _ in islice(keywords, SEARCH_TERM_COUNT + 1)) > SEARCH_TERM_COUNT
     
     def _extract_search_terms(self, text: str) -> str:
         """Extract key terms from reconstructed text for better search results."""
-        common_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'was', 'are', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'}
-        
-        words = text.lower().split()
-        keywords = [word.strip('.,!?;:"') for word in words if word.lower() not in common_words and len(word) > 2]
-        
-        return ' '.join(keywords[:7])
+        return ' '.join(islice(self._keywords(text), SEARCH_TERM_COUNT))
+    
+    def _keywords(self, text: str) -> Iterator[str]:
+        """Yield the lowercase non-stopword tokens of a text, in order."""
+        tokens = _TOKEN_RE.findall(text.lower())
+        return (token for token in tokens if token not in _COMMON_WORDS)
 
 # Initialize service
 service = TextReconstructionService()
 
+# Background job queue, available when REDIS_URL is configured
+redis_url = os.getenv('REDIS_URL')
+job_queue = Queue('recon', connection=SyncRedis.from_url(redis_url)) if redis_url else None
+
+# Largest number of texts accepted by a single batch request
+MAX_BATCH_SIZE = 32
+
+# Caps concurrent upstream calls issued by batch requests
+batch_semaphore = asyncio.Semaphore(64)
+
+async def _limited(coro):
+    """Await a coroutine while holding a batch concurrency slot."""
+    async with batch_semaphore:
+        return await coro
+
+def _new_http_client() -> httpx.AsyncClient:
+    """Create an HTTP/2 client for outbound API calls."""
+    limits = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=75)
+    return httpx.AsyncClient(http2=True, limits=limits, timeout=5)
+
+def run_reconstruction_job(input_text: str) -> Dict[str, Any]:
+    """Run a queued reconstruction in an rq worker process."""
+    return asyncio.run(_run_reconstruction_job(input_text))
+
+async def _run_reconstruction_job(input_text: str) -> Dict[str, Any]:
+    service.http = _new_http_client()
+    try:
+        return await service.process(input_text)
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e)
+        }
+    finally:
+        await service.http.aclose()
+
+@app.before_serving
+async def start_service():
+    """Create the Gemini context cache and load the semantic cache."""
+    await asyncio.to_thread(service.start)
+
+@app.before_serving
+async def open_http_client():
+    """Create the shared HTTP client used for outbound API calls."""
+    service.http = _new_http_client()
+
+async def _refresh_prompt_cache_periodically():
+    """Re-create the Gemini context cache shortly before its TTL expires."""
+    interval = (PROMPT_CACHE_TTL - datetime.timedelta(minutes=5)).total_seconds()
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.to_thread(service.refresh_prompt_cache)
+
+@app.before_serving
+async def start_prompt_cache_refresh():
+    """Keep the Gemini context cache alive while the server runs."""
+    # Nothing to refresh when the prompt is too small for context caching
+    app.prompt_cache_task = None
+    if service.prompt_cache is not None:
+        app.prompt_cache_task = asyncio.create_task(_refresh_prompt_cache_periodically())
+
+@app.after_serving
+async def close_http_client():
+    """Close the shared HTTP client on shutdown."""
+    await service.http.aclose()
+
+@app.after_serving
+async def stop_prompt_cache_refresh():
+    """Stop refreshing the Gemini context cache on shutdown."""
+    if app.prompt_cache_task is not None:
+        app.prompt_cache_task.cancel()
+
 @app.route('/')
-def index():
+async def index():
     """Serve the main HTML page."""
-    return send_from_directory('.', 'index.html')
+    return await send_from_directory('.', 'index.html')
 
 @app.route('/api/health', methods=['GET'])
-def health_check():
+async def health_check():
     """Health check endpoint."""
     return jsonify({'status': 'ok', 'message': 'API is running'})
 
 @app.route('/api/reconstruct', methods=['POST'])
-def reconstruct_text():
+async def reconstruct_text():
     """Main endpoint to reconstruct text."""
     try:
-        data = request.get_json()
+        data = await request.get_json()
+        
+        if not data or 'text' not in data:
+            return jsonify({'error': 'No text provided'}), 400
+        
+        input_text = data['text'].strip()
+        
+        if not input_text:
+            return jsonify({'error': 'Text cannot be empty'}), 400
+        
+        return jsonify(await service.process(input_text))
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/reconstruct_async', methods=['POST'])
+async def reconstruct_text_async():
+    """Queue a reconstruction and return a job ID to poll for the result."""
+    try:
+        data = await request.get_json()
         
         if not data or 'text' not in data:
             return jsonify({'error': 'No text provided'}), 400
         
+        if not isinstance(data['text'], str):
+            return jsonify({'error': 'Text must be a string'}), 400
+        
         input_text = data['text'].strip()
         
         if not input_text:
             return jsonify({'error': 'Text cannot be empty'}), 400
         
-        # Step 1: Reconstruct text
-        reconstructed_text = service.reconstruct_text_with_ai(input_text)
+        # Cached reconstructions are cheap enough to answer right away
+        if await service.has_cached_reconstruction(input_text):
+            return jsonify(await service.process(input_text))
         
-        # Step 2: Search for sources
-        sources = service.search_contextual_sources(reconstructed_text)
+        if job_queue is None:
+            return jsonify({
+                'success': False,
+                'error': 'Background jobs require REDIS_URL to be configured'
+            }), 503
+        
+        job = await asyncio.to_thread(job_queue.enqueue, 'app.run_reconstruction_job', input_text)
         
-        # Step 3: Return results
         return jsonify({
             'success': True,
-            'original_text': input_text,
-            'reconstructed_text': reconstructed_text,
-            'sources': sources
+            'job_id': job.id
+        }), 202
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/result/<job_id>', methods=['GET'])
+async def reconstruction_result(job_id: str):
+    """Return the result of a queued reconstruction once it has finished."""
+    try:
+        if job_queue is None:
+            return jsonify({
+                'success': False,
+                'error': 'Background jobs require REDIS_URL to be configured'
+            }), 503
+        
+        try:
+            job = await asyncio.to_thread(Job.fetch, job_id, connection=job_queue.connection)
+        except NoSuchJobError:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        status = await asyncio.to_thread(job.get_status)
+        
+        if status == JobStatus.FINISHED:
+            result = await asyncio.to_thread(job.return_value)
+            if result is None:
+                return jsonify({
+                    'success': False,
+                    'error': 'Job result is no longer available'
+                }), 500
+            return jsonify(result), 200 if result['success'] else 500
+        
+        if status in (JobStatus.FAILED, JobStatus.STOPPED, JobStatus.CANCELED):
+            return jsonify({
+                'success': False,
+                'error': f'Job {status.value}'
+            }), 500
+        
+        return jsonify({
+            'success': True,
+            'status': status.value
+        }), 202
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/reconstruct_batch', methods=['POST'])
+async def reconstruct_batch():
+    """Reconstruct many texts concurrently."""
+    try:
+        data = await request.get_json()
+        
+        if not data or not isinstance(data.get('texts'), list):
+            return jsonify({'error': 'No texts provided'}), 400
+        
+        if len(data['texts']) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'At most {MAX_BATCH_SIZE} texts can be reconstructed per batch'}), 400
+        
+        if not all(isinstance(text, str) for text in data['texts']):
+            return jsonify({'error': 'Texts must be strings'}), 400
+        
+        texts = [text.strip() for text in data['texts']]
+        
+        if not texts or not all(texts):
+            return jsonify({'error': 'Texts cannot be empty'}), 400
+        
+        # Step 1: Reconstruct all texts concurrently
+        reconstructed = await asyncio.gather(
+            *[_limited(service.reconstruct_text_with_ai(text)) for text in texts],
+            return_exceptions=True
+        )
+        
+        # Step 2: Search for sources of every successful reconstruction
+        async def _search(result):
+            if isinstance(result, Exception):
+                return result
+            return await _limited(service.search_contextual_sources(result))
+        
+        sources = await asyncio.gather(
+            *[_search(result) for result in reconstructed],
+            return_exceptions=True
+        )
+        
+        # Step 3: Return per-text results in request order
+        results = []
+        for text, reconstructed_text, text_sources in zip(texts, reconstructed, sources):
+            if isinstance(text_sources, Exception):
+                results.append({
+                    'success': False,
+                    'original_text': text,
+                    'error': str(text_sources)
+                })
+            else:
+                results.append({
+                    'success': True,
+                    'original_text': text,
+                    'reconstructed_text': reconstructed_text,
+                    'sources': text_sources
+                })
+        
+        return jsonify({
+            'success': True,
+            'results': results
         })
         
     except Exception as e:
@@ -145,6 +775,62 @@ def reconstruct_text():
             'error': str(e)
         }), 500
 
+@app.route('/api/reconstruct_stream', methods=['POST'])
+async def reconstruct_text_stream():
+    """Stream the reconstruction as server-sent events, followed by its sources."""
+    try:
+        data = await request.get_json()
+        
+        if not data or 'text' not in data:
+            return jsonify({'error': 'No text provided'}), 400
+        
+        if not isinstance(data['text'], str):
+            return jsonify({'error': 'Text must be a string'}), 400
+        
+        input_text = data['text'].strip()
+        
+        if not input_text:
+            return jsonify({'error': 'Text cannot be empty'}), 400
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+    
+    def _event(payload: Dict[str, Any]) -> str:
+        return f"data: {orjson.dumps(payload).decode()}\n\n"
+    
+    async def generate():
+        try:
+            # Steps 1-2: Stream reconstructed text, searching for sources once the query is known
+            chunks = []
+            async for kind, value in service.stream_reconstruction_with_sources(input_text):
+                if kind == 'chunk':
+                    chunks.append(value)
+                    yield _event({'type': 'chunk', 'text': value})
+                else:
+                    sources = value
+            reconstructed_text = ''.join(chunks).strip()
+            
+            # Step 3: Send the final result
+            yield _event({
+                'type': 'done',
+                'success': True,
+                'original_text': input_text,
+                'reconstructed_text': reconstructed_text,
+                'sources': sources
+            })
+            
+        except Exception as e:
+            yield _event({
+                'type': 'error',
+                'success': False,
+                'error': str(e)
+            })
+    
+    return generate(), 200, {'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache'}
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5001))
-    app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
+    uvicorn.run(app, host='0.0.0.0', port=port)
\ No newline at end of file
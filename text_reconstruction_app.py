@@ -5,12 +5,33 @@ import json
 import time
 from typing import List, Dict, Any
 import google.generativeai as genai
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
 
+# Words skipped when building a search query from reconstructed text
+_COMMON_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'was', 'are', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'})
+
+
 class TextReconstructionApp:
     
+    _PROMPT_TEMPLATE = """
+        You are a text reconstruction expert. Please analyze and reconstruct the following text:
+
+        Original text: "{input_text}"
+
+        Please perform the following tasks:
+        1. Expand all slang, abbreviations, and acronyms (e.g., "lol" → "laughing out loud", "brb" → "be right back")
+        2. Explain the context and meaning of any colloquial expressions (e.g., "epic fail" → "a significant and embarrassing mistake or failure")
+        3. Fill in any missing words or complete incomplete sentences to make the text coherent
+        4. Maintain the original tone and intent while making the text clear and professional
+        5. If the text appears to be a fragment of a larger conversation, provide context about what might have been discussed
+
+        Return only the reconstructed text without any additional commentary or formatting.
+        """
+    
     def __init__(self):
         load_dotenv()
         
@@ -26,22 +47,13 @@ class TextReconstructionApp:
         
         if not self.search_api_key or not self.search_engine_id:
             raise ValueError("GOOGLE_SEARCH_API_KEY and GOOGLE_SEARCH_ENGINE_ID required")
+        
+        # Reuse keep-alive connections to the search API across calls
+        self.http = requests.Session()
+        self.http.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=50))
     
     def reconstruct_text_with_ai(self, input_text: str) -> str:
-        prompt = f"""
-        You are a text reconstruction expert. Please analyze and reconstruct the following text:
-
-        Original text: "{input_text}"
-
-        Please perform the following tasks:
-        1. Expand all slang, abbreviations, and acronyms (e.g., "lol" → "laughing out loud", "brb" → "be right back")
-        2. Explain the context and meaning of any colloquial expressions (e.g., "epic fail" → "a significant and embarrassing mistake or failure")
-        3. Fill in any missing words or complete incomplete sentences to make the text coherent
-        4. Maintain the original tone and intent while making the text clear and professional
-        5. If the text appears to be a fragment of a larger conversation, provide context about what might have been discussed
-
-        Return only the reconstructed text without any additional commentary or formatting.
-        """
+        prompt = self._PROMPT_TEMPLATE.format(input_text=input_text)
         
         try:
             response = self.model.generate_content(prompt)
@@ -72,22 +84,22 @@ class TextReconstructionApp:
         }
         
         try:
-            response = requests.get(search_url, params=params)
+            response = self.http.get(search_url, params=params, timeout=5)
             response.raise_for_status()
             
-            data = response.json()
-            results = []
-            
-            for item in data.get('items', []):
-                results.append({
+            data = orjson.loads(response.content)
+            results = [
+                {
                     'title': item.get('title', ''),
                     'link': item.get('link', ''),
                     'snippet': item.get('snippet', '')
-                })
+                }
+                for item in data.get('items', ())
+            ]
             
             return results
             
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             raise Exception(f"Error performing web search: {str(e)}")
     
     def _extract_search_terms(self, text: str) -> str:
@@ -100,10 +112,8 @@ class TextReconstructionApp:
         Returns:
             String of key terms for searching
         """
-        common_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'was', 'are', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'}
-        
         words = text.lower().split()
-        keywords = [word.strip('.,!?;:"') for word in words if word.lower() not in common_words and len(word) > 2]
+        keywords = [word.strip('.,!?;:"') for word in words if word.lower() not in _COMMON_WORDS and len(word) > 2]
        
         return ' '.join(keywords[:7])
     